@@ -1,44 +1,208 @@
 import fitz
+import hashlib
+import os
+import pickle
 import re
+import sys
+import tempfile
+from array import array
 from collections import Counter
-from typing import List, Tuple, Dict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
+from typing import Callable, List, Tuple, Dict, Iterable, Iterator, NamedTuple, Optional
+
+DEFAULT_FONT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "wiki_pdf_chunker")
+
+# Below this many pages, starting worker processes costs more than it saves
+MIN_PAGES_FOR_WORKERS = 20
+
+# Font analyses already computed in this process, keyed like the disk cache
+_font_structure_memo: Dict[str, Dict] = {}
+_FONT_STRUCTURE_MEMO_SIZE = 32
+
+# Lines that are never headings: bare numbers, punctuation or reference
+# markers, plus common non-heading patterns (car PDF specific).
+# Fused into one alternation so each line is matched in a single call.
+_SKIP_RE = re.compile("|".join((
+    r'^[\d\.\[\]\(\)\s\-–—]+$',
+    # "Table of contents" and "See also" are section headings, not references
+    r'^(?:page|p\.|fig|figure|table(?!\s+of\s+contents\b)|see(?!\s+also\b)|cf|ibid|op\.?\s*cit|et\s+al)',
+    r'^\d+$',
+    r'^\[\d+\]',
+    r'^(?:retrieved|archived|isbn|doi)\b',
+)), re.IGNORECASE)
+
+# Car model section patterns, fused into one alternation
+_MAJOR_SECTION_RE = re.compile("|".join((
+    r'^(?:contents|table of contents)$',
+    r'^(?:introduction|overview|summary|abstract)$',
+    r'^(?:history|historical background|origins|development|background)',
+    r'^(?:design|styling|exterior|interior|body styles?)',
+    r'^(?:engines?|powertrain|drivetrain|transmissions?|performance|specifications|technical data)',
+    r'^(?:first|second|third|fourth|fifth|sixth|seventh|eighth)\s+(?:generation|gen)',
+    r'^(?:generation|gen)\s+\d+',
+    r'^(?:mk|mark)\s+[ivx\d]+',
+    r'^(?:model year|my)\s+\d{4}',
+    r'^\d{4}[-–—](?:\d{4}|present)',
+    r'^(?:sales|production|manufacturing|assembly)',
+    r'^(?:safety|crash tests?|recalls)',
+    r'^(?:reception|awards|motorsport|racing)',
+    r'^(?:see also|references|bibliography|further reading|external links|notes)$',
+)), re.IGNORECASE)
+
+# Skip and major patterns as one automaton: alternatives are tried in order, so a
+# skip match wins, and lastgroup tells the two outcomes apart in a single call
+_HEADING_CLASS_RE = re.compile(
+    f"(?P<skip>{_SKIP_RE.pattern})|(?P<major>{_MAJOR_SECTION_RE.pattern})", re.IGNORECASE)
+# Same automaton without Unicode matching. It agrees with _HEADING_CLASS_RE only on
+# printable ASCII: Unicode \s also matches the \x1c-\x1f separators, ASCII \s does not
+_HEADING_CLASS_ASCII_RE = re.compile(_HEADING_CLASS_RE.pattern, re.IGNORECASE | re.ASCII)
+
+# Blank-line paragraph separator
+_PARA_RE = re.compile(r'\n\s*\n')
+
+# Appendix-style sections that close out a Wikipedia article
+_TAIL_RE = re.compile(r'(?i)^(?:see also|references|bibliography|further reading|external links|notes)$')
+
+# First character of a word, for the title-case check
+_first_char = itemgetter(0)
+
+# Hot-loop accessors for PyMuPDF span dicts
+_span_size = itemgetter("size")
+_span_text = itemgetter("text")
+
+
+# A page's non-empty lines as parallel columns: texts and their font sizes
+PageLines = Tuple[List[str], array]
+
+
+def _page_lines(page, min_font_size: float) -> PageLines:
+    """Text and font size of each non-empty line on a page, ignoring tiny spans"""
+    texts = []
+    sizes = array('d')
+    # Text-only flags: image blocks (and their pixel data) are never built
+    blocks = page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)["blocks"]
+    for block in blocks:
+        if "lines" not in block:
+            continue
+            
+        for line in block["lines"]:
+            # One pass per line: collect visible span text and track the largest size
+            parts = []
+            font_size = 0.0
+            for span in line["spans"]:
+                size = _span_size(span)
+                if size >= min_font_size:
+                    parts.append(_span_text(span))
+                    if size > font_size:
+                        font_size = size
+            
+            text = "".join(parts).strip()
+            if text and font_size > 0:
+                texts.append(text)
+                sizes.append(font_size)
+    return texts, sizes
+
+
+@lru_cache(maxsize=8)
+def _heading_test(heading_threshold: float) -> Callable[[str, float], bool]:
+    """Major-heading test with one document's thresholds baked in"""
+    title_case_threshold = heading_threshold * 1.2
+    
+    # Memoized: running headers and repeated titles recur across pages
+    @lru_cache(maxsize=8192)
+    def is_heading(text: str, font_size: float) -> bool:
+        # Must be significantly larger than body text (cheapest test, rejects most lines)
+        if font_size < heading_threshold:
+            return False
+        
+        # Skip very short or very long text
+        if len(text) < 5 or len(text) > 100:
+            return False
+        
+        # Skip numbers, punctuation, references and other non-heading patterns,
+        # otherwise look for car model section patterns
+        ascii_safe = text.isascii() and text.isprintable()
+        match = (_HEADING_CLASS_ASCII_RE if ascii_safe else _HEADING_CLASS_RE).match(text)
+        if match is not None:
+            return match.lastgroup == 'major'
+        
+        # Without a pattern match only clearly title-cased text at a larger font
+        # qualifies, so check the font before splitting the text
+        if font_size < title_case_threshold:
+            return False
+        
+        # Check if it looks like a proper title (title case)
+        words = text.split()
+        if len(words) >= 2:
+            # map/itemgetter keep the per-word loop in C (no generator frame per word)
+            capitalized_words = sum(map(str.isupper, map(_first_char, words)))
+            # capitalized / len(words) >= 0.6, kept in integers
+            return capitalized_words * 5 >= len(words) * 3
+        return text[0].isupper()
+    
+    return is_heading
+
+
+# Document opened once per worker process by _init_page_worker
+_worker_doc = None
+
+
+def _init_page_worker(pdf_path: str):
+    global _worker_doc
+    _worker_doc = fitz.open(pdf_path, filetype="pdf")
+
+
+def _extract_page_lines(page_num: int, min_font_size: float) -> PageLines:
+    """_page_lines for one page of the worker's document"""
+    return _page_lines(_worker_doc[page_num], min_font_size)
+
+
+class Chunk(NamedTuple):
+    title: str
+    content: str
+    word_count: int
+
 
 class CarModelPDFChunker:
+    __slots__ = ('min_font_size', 'max_words_per_chunk', 'min_section_words', 'font_threshold_ratio',
+                 'drop_tail_sections', 'font_cache_dir', 'workers', 'verbose')
+    
     def __init__(self, 
                  min_font_size: float = 6.0, 
                  max_words_per_chunk: int = 800,
                  min_section_words: int = 100,
-                 font_threshold_ratio: float = 1.5):
+                 font_threshold_ratio: float = 1.5,
+                 drop_tail_sections: bool = False,
+                 font_cache_dir: Optional[str] = DEFAULT_FONT_CACHE_DIR,
+                 workers: Optional[int] = 1,
+                 verbose: bool = True):
         self.min_font_size = min_font_size
         self.max_words_per_chunk = max_words_per_chunk
         self.min_section_words = min_section_words
         self.font_threshold_ratio = font_threshold_ratio
+        self.drop_tail_sections = drop_tail_sections
+        self.font_cache_dir = font_cache_dir  # None disables the on-disk cache
+        self.workers = workers  # Processes used for page text extraction; None uses every CPU
+        self.verbose = verbose  # Print font analysis and detected headings
         
-    def analyze_font_structure(self, doc) -> Dict:
+    def analyze_font_structure(self, doc, executor: Optional[ProcessPoolExecutor] = None) -> Dict:
         """Analyze document to find body text and major heading fonts"""
-        font_sizes = []
-        
-        for page in doc:
-            blocks = page.get_text("dict")["blocks"]
-            for block in blocks:
-                if "lines" not in block:
-                    continue
-                    
-                for line in block["lines"]:
-                    line_text = ""
-                    max_font_size = 0.0
-                    
-                    for span in line["spans"]:
-                        if span["size"] >= self.min_font_size:
-                            line_text += span["text"]
-                            max_font_size = max(max_font_size, span["size"])
-                    
-                    if line_text.strip() and max_font_size > 0:
-                        font_sizes.append(max_font_size)
-        
-        # Find the most common font size (likely body text)
-        font_counter = Counter([round(size, 1) for size in font_sizes])
-        body_font = max(font_counter, key=font_counter.get)
+        # Only the size column of each page is kept, so this pass holds one page at a time
+        return self._font_structure_from_sizes(
+            size for _, sizes in self._iter_page_lines(doc, executor) for size in sizes)
+    
+    def _font_structure_from_sizes(self, font_sizes: Iterable[float]) -> Dict:
+        """Body font, heading threshold and size distribution from per-line font sizes"""
+        # Find the most common font size (likely body text); map() keeps the
+        # rounding and counting in C instead of a generator frame per line
+        font_counter = Counter(map(round, font_sizes, repeat(1)))
+        # most_common(n) is a heap selection, and its first entry is the body font
+        font_distribution = font_counter.most_common(10)
+        body_font = font_distribution[0][0] if font_distribution else 10.0
         
         # Calculate threshold for major headings
         heading_threshold = body_font * self.font_threshold_ratio
@@ -46,151 +210,279 @@ class CarModelPDFChunker:
         return {
             'body_font': body_font,
             'heading_threshold': heading_threshold,
-            'font_distribution': font_counter.most_common(10)
+            'font_distribution': font_distribution
         }
     
+    def _font_cache_key(self, pdf_path: str) -> str:
+        """Fingerprint of a PDF's identity, first 4KB and the font settings"""
+        stat = os.stat(pdf_path)
+        key = hashlib.sha1()
+        key.update(repr((os.path.abspath(pdf_path), stat.st_size, int(stat.st_mtime),
+                         self.min_font_size, self.font_threshold_ratio)).encode())
+        with open(pdf_path, "rb") as f:
+            key.update(f.read(4096))
+        return key.hexdigest()
+    
+    def _load_font_structure(self, key: str) -> Optional[Dict]:
+        """Previously computed font analysis for a cache key, from memory or disk"""
+        font_analysis = _font_structure_memo.get(key)
+        if font_analysis is not None or self.font_cache_dir is None:
+            return font_analysis
+        try:
+            with open(os.path.join(self.font_cache_dir, key + ".pkl"), "rb") as f:
+                font_analysis = pickle.load(f)
+        except Exception:
+            # A damaged pickle can fail in many ways; any of them means "not cached"
+            return None
+        if not (isinstance(font_analysis, dict)
+                and isinstance(font_analysis.get('body_font'), (int, float))
+                and isinstance(font_analysis.get('heading_threshold'), (int, float))
+                and isinstance(font_analysis.get('font_distribution'), list)):
+            return None
+        self._remember_font_structure(key, font_analysis)
+        return font_analysis
+    
+    def _store_font_structure(self, key: str, font_analysis: Dict):
+        """Save a font analysis for later runs on the same file"""
+        self._remember_font_structure(key, font_analysis)
+        if self.font_cache_dir is None:
+            return
+        try:
+            os.makedirs(self.font_cache_dir, exist_ok=True)
+            # Write to a temp file and rename, so readers never see a partial pickle
+            fd, tmp_path = tempfile.mkstemp(dir=self.font_cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(font_analysis, f)
+                os.replace(tmp_path, os.path.join(self.font_cache_dir, key + ".pkl"))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass  # Caching is best effort
+    
+    @staticmethod
+    def _remember_font_structure(key: str, font_analysis: Dict):
+        """Keep an analysis in the in-process memo, evicting the oldest entry when full"""
+        if len(_font_structure_memo) >= _FONT_STRUCTURE_MEMO_SIZE:
+            del _font_structure_memo[next(iter(_font_structure_memo))]
+        _font_structure_memo[key] = font_analysis
+    
+    def cached_font_structure(self, pdf_path: str, doc,
+                              executor: Optional[ProcessPoolExecutor] = None) -> Dict:
+        """analyze_font_structure, reusing a previous result for the same file"""
+        # Fingerprinting reads the file, so do it once for both the lookup and the store
+        key = self._font_cache_key(pdf_path)
+        font_analysis = self._load_font_structure(key)
+        if font_analysis is None:
+            font_analysis = self.analyze_font_structure(doc, executor)
+            self._store_font_structure(key, font_analysis)
+        return font_analysis
+    
     def is_major_heading(self, text: str, font_size: float, font_analysis: Dict) -> bool:
         """Conservative detection of only major section headings"""
+        return _heading_test(font_analysis['heading_threshold'])(text, font_size)
+    
+    def _heading_classifier(self, font_analysis: Dict) -> Tuple[float, Callable[[str, float], bool]]:
+        """Smallest font that can be a heading, and the per-line heading test for one document"""
+        if type(self).is_major_heading is CarModelPDFChunker.is_major_heading:
+            # Built-in rules: memoized test, and smaller fonts are rejected without a call
+            heading_threshold = font_analysis['heading_threshold']
+            return heading_threshold, _heading_test(heading_threshold)
         
-        # Skip very short or very long text
-        if len(text) < 5 or len(text) > 100:
-            return False
-            
-        # Skip if it's just numbers, punctuation, or references
-        if re.match(r'^[\d\.\[\]\(\)\s\-–—]+$', text):
-            return False
-            
-        # Skip common non-heading patterns (car PDF specific)
-        skip_patterns = [
-            r'^(page|p\.|fig|figure|table|see|cf|ibid|op\.?\s*cit|et\s+al)',
-            r'^\d+
-        
-        if any(re.search(pattern, text, re.IGNORECASE) for pattern in skip_patterns):
-            return False
+        # A subclass override sees every line, whatever its font size
+        is_major_heading = self.is_major_heading
+        return float('-inf'), lambda text, font_size: is_major_heading(text, font_size, font_analysis)
+    
+    def split_large_section(self, title: str, text: str,
+                            word_count: Optional[int] = None) -> List[Chunk]:
+        """Split very large sections into manageable chunks"""
+        title = sys.intern(title)
+        # Callers that tracked the count while building the section skip re-tokenizing it
+        if word_count is None:
+            word_count = len(text.split())
+        if word_count <= self.max_words_per_chunk:
+            return [Chunk(title, text, word_count)]
         
-        # Must be significantly larger than body text
-        if font_size < font_analysis['heading_threshold']:
-            return False
-            
-        # Look for car model section patterns
-        major_section_patterns = [
-            r'^(contents|table of contents)
+        # Try to split at paragraph boundaries first. Sections built from extracted
+        # lines have no blank lines, so fall back to packing whole lines
+        paragraphs = _PARA_RE.split(text)
+        separator = "\n\n"
+        if len(paragraphs) == 1:
+            paragraphs = text.split("\n")
+            separator = "\n"
         
-        matches_major_pattern = any(re.match(pattern, text, re.IGNORECASE) 
-                                  for pattern in major_section_patterns)
+        # Prefix sums of paragraph word counts
+        cum_words = [0]
+        for paragraph in paragraphs:
+            cum_words.append(cum_words[-1] + len(paragraph.split()))
         
-        # Check if it looks like a proper title (title case)
-        words = text.split()
-        if len(words) >= 2:
-            capitalized_ratio = sum(1 for word in words if word[0].isupper()) / len(words)
-            is_title_case = capitalized_ratio >= 0.6
-        else:
-            is_title_case = text[0].isupper()
+        # Chunks only start at paragraphs with words, so empty ones stay with the chunk before
+        # them. Every start in a window then adds a word, and no window spans more than
+        # max_words + 1 starts.
+        n = len(paragraphs)
+        starts = [0] + [i for i in range(1, n) if cum_words[i + 1] > cum_words[i]] + [n]
+        start_words = [cum_words[i] for i in starts]
         
-        # Only accept if it matches major patterns OR is clearly title case with good font size
-        return matches_major_pattern or (is_title_case and font_size >= font_analysis['heading_threshold'] * 1.2)
-    
-    def split_large_section(self, title: str, text: str) -> List[Tuple[str, str]]:
-        """Split very large sections into manageable chunks"""
-        words = text.split()
-        if len(words) <= self.max_words_per_chunk:
-            return [(title, text)]
+        # cost[j] = best cost of packing paragraphs[:starts[j]]; link_prev[j] = start of last
+        # chunk. Each chunk pays (unused words)^2, so chunks come out evenly filled instead of
+        # greedy-full with an underfilled tail.
+        m = len(starts) - 1
+        max_words = self.max_words_per_chunk
+        cost = [0.0] + [float('inf')] * m
+        link_prev = [0] * (m + 1)
         
-        chunks = []
-        # Try to split at paragraph boundaries first
-        paragraphs = re.split(r'\n\s*\n', text)
+        first = 0
+        for j in range(1, m + 1):
+            end_words = start_words[j]
+            # A chunk may only exceed the limit when it is a single oversized paragraph
+            while end_words - start_words[first] > max_words and first < j - 1:
+                first += 1
+            best = cost[j]
+            for i in range(first, j):
+                slack = max(max_words - (end_words - start_words[i]), 0)
+                penalty = slack * slack
+                # Later starts leave more slack, so once it alone costs more than the best
+                # packing so far, nothing further in the window can win
+                if penalty > best:
+                    break
+                candidate = cost[i] + penalty
+                if candidate <= best:
+                    best = candidate
+                    link_prev[j] = i
+            cost[j] = best
         
-        current_chunk = ""
-        current_words = 0
-        chunk_num = 1
+        # Walk the links back to recover chunk boundaries
+        boundaries = []
+        j = m
+        while j > 0:
+            boundaries.append((starts[link_prev[j]], starts[j]))
+            j = link_prev[j]
+        boundaries.reverse()
         
-        for paragraph in paragraphs:
-            para_words = len(paragraph.split())
-            
-            if current_words + para_words > self.max_words_per_chunk and current_chunk:
-                chunk_title = title if chunk_num == 1 else f"{title} (Part {chunk_num})"
-                chunks.append((chunk_title, current_chunk.strip()))
-                current_chunk = paragraph
-                current_words = para_words
-                chunk_num += 1
-            else:
-                current_chunk += ("\n\n" + paragraph if current_chunk else paragraph)
-                current_words += para_words
+        # The part count is known up front, so build every title once
+        part_titles = [title] + [f"{title} (Part {k})" for k in range(2, len(boundaries) + 1)]
         
-        if current_chunk.strip():
-            chunk_title = title if chunk_num == 1 else f"{title} (Part {chunk_num})"
-            chunks.append((chunk_title, current_chunk.strip()))
+        chunks = []
+        for i, j in boundaries:
+            chunk_text = separator.join(paragraphs[i:j]).strip()
+            if not chunk_text:
+                continue
+            chunks.append(Chunk(part_titles[len(chunks)], chunk_text, cum_words[j] - cum_words[i]))
         
         return chunks
     
-    def extract_smart_chunks(self, pdf_path: str) -> List[Tuple[str, str]]:
+    def extract_smart_chunks(self, pdf_path: str) -> List[Chunk]:
         """Extract major topic-based chunks from car model Wikipedia PDF"""
-        doc = fitz.open(pdf_path)
-        
-        # Analyze font structure
-        font_analysis = self.analyze_font_structure(doc)
-        print(f"Font analysis:")
-        print(f"  Body font: {font_analysis['body_font']}")
-        print(f"  Heading threshold: {font_analysis['heading_threshold']}")
-        print(f"  Font distribution: {font_analysis['font_distribution'][:5]}")
-        
-        # Extract all text with formatting
-        all_lines = []
-        for page in doc:
-            blocks = page.get_text("dict")["blocks"]
-            for block in blocks:
-                if "lines" not in block:
-                    continue
-                    
-                for line in block["lines"]:
-                    line_text = ""
-                    max_font_size = 0.0
-                    
-                    for span in line["spans"]:
-                        if span["size"] >= self.min_font_size:
-                            line_text += span["text"]
-                            max_font_size = max(max_font_size, span["size"])
-                    
-                    line_text = line_text.strip()
-                    if line_text and max_font_size > 0:
-                        all_lines.append((line_text, max_font_size))
-        
-        # Process lines to identify major sections only
-        sections = []
-        current_section_title = "Introduction"
-        current_section_text = ""
+        return list(self.iter_smart_chunks(pdf_path))
+    
+    def iter_smart_chunks(self, pdf_path: str) -> Iterator[Chunk]:
+        """Yield major topic-based chunks as soon as each section is closed"""
+        # The type hint skips format detection; the with block closes the doc even if
+        # the consumer stops early or extraction fails
+        with fitz.open(pdf_path, filetype="pdf") as doc, self._page_pool(doc, pdf_path) as executor:
+            # Analyze font structure. On a cache miss this is a separate sizes-only pass,
+            # so section building below still streams page by page. Both passes share
+            # one worker pool
+            font_analysis = self.cached_font_structure(pdf_path, doc, executor)
+            yield from self._iter_document_chunks(doc, font_analysis, executor)
+    
+    @contextmanager
+    def _page_pool(self, doc, pdf_path: str) -> Iterator[Optional[ProcessPoolExecutor]]:
+        """Worker pool for extracting doc's pages, or None when they are extracted in-process"""
+        if ((self.workers is not None and self.workers <= 1) or not pdf_path
+                or doc.page_count < MIN_PAGES_FOR_WORKERS):
+            yield None
+            return
+        
+        executor = ProcessPoolExecutor(self.workers, initializer=_init_page_worker, initargs=(pdf_path,))
+        try:
+            yield executor
+        finally:
+            # Don't parse pages nobody will read if the consumer stopped early
+            executor.shutdown(cancel_futures=True)
+    
+    def _iter_page_lines(self, doc, executor: Optional[ProcessPoolExecutor]) -> Iterator[PageLines]:
+        """Per-page line lists in page order, extracted by the executor's workers if given"""
+        if executor is None:
+            for page in doc:
+                yield _page_lines(page, self.min_font_size)
+            return
+        
+        yield from executor.map(_extract_page_lines, range(doc.page_count),
+                                repeat(self.min_font_size), chunksize=4)
+    
+    def _iter_lines(self, doc, executor: Optional[ProcessPoolExecutor]) -> Iterator[Tuple[str, float]]:
+        """(text, font_size) for every line of the document, in reading order"""
+        for texts, sizes in self._iter_page_lines(doc, executor):
+            yield from zip(texts, sizes)
+    
+    def _iter_document_chunks(self, doc, font_analysis: Dict,
+                              executor: Optional[ProcessPoolExecutor]) -> Iterator[Chunk]:
+        """Run the section state machine over an open document"""
+        verbose = self.verbose
+        if verbose:
+            print("\n".join((
+                "Font analysis:",
+                f"  Body font: {font_analysis['body_font']}",
+                f"  Heading threshold: {font_analysis['heading_threshold']}",
+                f"  Font distribution: {font_analysis['font_distribution'][:5]}",
+            )))
+        
+        # Lines below this size can never be headings, so they skip the regex checks
+        heading_min_size, is_heading = self._heading_classifier(font_analysis)
+        
+        # Loop invariants bound to locals to keep per-line overhead down
+        min_section_words = self.min_section_words
+        drop_tail_sections = self.drop_tail_sections
+        
+        # Stream lines straight into the section builder (no all_lines buffer)
+        # Headings of too-small sections are folded into the title; joined once at flush
+        current_title_parts = ["Introduction"]
+        current_section_lines = []
+        add_section_line = current_section_lines.append
+        current_section_word_count = 0
         detected_headings = []
         
-        for i, (text, font_size) in enumerate(all_lines):
-            if self.is_major_heading(text, font_size, font_analysis):
+        for text, font_size in self._iter_lines(doc, executor):
+            if font_size >= heading_min_size and is_heading(text, font_size):
+                # References, external links etc. run to the end of the article
+                if drop_tail_sections and _TAIL_RE.match(text):
+                    break
+                
                 # Save previous section if it's substantial
-                if current_section_text.strip() and len(current_section_text.split()) >= self.min_section_words:
-                    chunks = self.split_large_section(current_section_title, current_section_text.strip())
-                    sections.extend(chunks)
-                elif current_section_text.strip():
+                if current_section_lines and current_section_word_count >= min_section_words:
+                    yield from self.split_large_section(" - ".join(current_title_parts),
+                                                        "\n".join(current_section_lines),
+                                                        current_section_word_count)
+                elif current_section_lines:
                     # If section is too small, append to title for context
-                    current_section_title = f"{current_section_title} - {text}"
-                    current_section_text += text + "\n"
+                    current_title_parts.append(text)
+                    add_section_line(text)
+                    current_section_word_count += len(text.split())
                     continue
                 
                 # Start new section
-                current_section_title = text
-                current_section_text = ""
-                detected_headings.append(f"'{text}' (font: {font_size})")
+                current_title_parts = [sys.intern(text)]  # Boilerplate headings repeat across documents
+                current_section_lines.clear()  # Already joined, and add_section_line stays bound
+                current_section_word_count = 0
+                if verbose:
+                    detected_headings.append((text, font_size))  # Formatted only for the report
             else:
-                current_section_text += text + "\n"
+                add_section_line(text)
+                current_section_word_count += len(text.split())
         
         # Save final section
-        if current_section_text.strip() and len(current_section_text.split()) >= self.min_section_words:
-            chunks = self.split_large_section(current_section_title, current_section_text.strip())
-            sections.extend(chunks)
+        if current_section_lines and current_section_word_count >= min_section_words:
+            yield from self.split_large_section(" - ".join(current_title_parts),
+                                                "\n".join(current_section_lines),
+                                                current_section_word_count)
         
-        print(f"\nDetected {len(detected_headings)} major headings:")
-        for heading in detected_headings:
-            print(f"  - {heading}")
-        
-        doc.close()
-        return sections
+        # One write for the whole report instead of one per heading
+        if verbose:
+            report = [f"\nDetected {len(detected_headings)} major headings:"]
+            report.extend(f"  - '{text}' (font: {font_size})" for text, font_size in detected_headings)
+            print("\n".join(report))
 
 # Usage example with better defaults
 def process_car_pdf(pdf_path: str):
@@ -201,17 +493,17 @@ def process_car_pdf(pdf_path: str):
         font_threshold_ratio=1.5      # Must be 1.5x body font to be heading
     )
     
-    chunks = chunker.extract_smart_chunks(pdf_path)
-    
-    print(f"\nFinal result: {len(chunks)} chunks from PDF")
-    print("=" * 60)
+    # Consume chunks as they are produced; only the previews are kept for the report
+    report = []
+    chunk_count = 0
+    for chunk_count, chunk in enumerate(chunker.iter_smart_chunks(pdf_path), 1):
+        report.append(f"\n🔹 Chunk {chunk_count}: {chunk.title}")
+        report.append(f"📊 Words: {chunk.word_count}")
+        report.append("-" * 50)
+        report.append(chunk.content[:200] + "..." if len(chunk.content) > 200 else chunk.content)
     
-    for i, (heading, content) in enumerate(chunks, 1):
-        word_count = len(content.split())
-        print(f"\n🔹 Chunk {i}: {heading}")
-        print(f"📊 Words: {word_count}")
-        print("-" * 50)
-        print(content[:200] + "..." if len(content) > 200 else content)
+    # Write the report once, headed by the final count
+    print("\n".join([f"\nFinal result: {chunk_count} chunks from PDF", "=" * 60] + report))
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,205 @@
+import importlib.util
+import os
+import sys
+import time
+
+import fitz
+import pytest
+
+# 2.py is not an importable module name, so load it from its path
+_spec = importlib.util.spec_from_file_location("car_chunker", os.path.join(os.path.dirname(__file__), "2.py"))
+chunker_mod = importlib.util.module_from_spec(_spec)
+# Registered by name so the process pool can pickle the module's functions
+sys.modules[_spec.name] = chunker_mod
+_spec.loader.exec_module(chunker_mod)
+
+CarModelPDFChunker = chunker_mod.CarModelPDFChunker
+
+
+def _body_lines(word, count, words_per_line=10):
+    return [" ".join(f"{word}{i}" for i in range(words_per_line)) for _ in range(count)]
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Write a PDF from (text, font_size) lines, starting a new page when one fills up"""
+    def make(lines, name="doc.pdf"):
+        doc = fitz.open()
+        page, y = doc.new_page(), 50
+        for text, size in lines:
+            if y > 780:
+                page, y = doc.new_page(), 50
+            page.insert_text((40, y), text, fontsize=size)
+            y += size + 4
+        path = str(tmp_path / name)
+        doc.save(path)
+        doc.close()
+        return path
+    return make
+
+
+def test_split_large_section_packs_lines_without_blank_lines():
+    chunker = CarModelPDFChunker(max_words_per_chunk=800, font_cache_dir=None)
+    text = "\n".join(_body_lines("w", 320))  # 3200 words, no paragraph breaks
+
+    chunks = chunker.split_large_section("Engines", text)
+
+    word_counts = [chunk.word_count for chunk in chunks]
+    assert len(chunks) > 1
+    assert all(count <= 800 for count in word_counts)
+    assert sum(word_counts) == 3200
+    assert [chunk.title for chunk in chunks[:2]] == ["Engines", "Engines (Part 2)"]
+    assert "\n".join(chunk.content for chunk in chunks) == text
+
+
+def test_split_large_section_evens_out_chunk_sizes():
+    chunker = CarModelPDFChunker(max_words_per_chunk=800, font_cache_dir=None)
+    text = "\n\n".join(_body_lines("p", 170))  # 1700 words in 10-word paragraphs
+
+    chunks = chunker.split_large_section("Design", text)
+
+    # Greedy packing would give 800 + 800 + 100
+    word_counts = [chunk.word_count for chunk in chunks]
+    assert len(word_counts) == 3
+    assert max(word_counts) - min(word_counts) <= 10
+
+
+def test_split_large_section_stays_fast_on_one_word_lines():
+    chunker = CarModelPDFChunker(max_words_per_chunk=800, font_cache_dir=None)
+    text = "\n".join(f"w{i}" for i in range(50000))
+
+    start = time.perf_counter()
+    chunks = chunker.split_large_section("Specifications", text)
+    elapsed = time.perf_counter() - start
+
+    assert sum(chunk.word_count for chunk in chunks) == 50000
+    # Scanning every start up to the word limit took about 10 s here; the pruned window
+    # takes under 2 s
+    assert elapsed < 5
+
+
+def test_long_extracted_section_is_split(make_pdf):
+    lines = [("History", 20)] + [(line, 10) for line in _body_lines("h", 200)]
+    chunker = CarModelPDFChunker(max_words_per_chunk=800, font_cache_dir=None)
+
+    chunks = chunker.extract_smart_chunks(make_pdf(lines))
+
+    assert len(chunks) > 1
+    assert all(count <= 800 for count in [chunk.word_count for chunk in chunks])
+
+
+def test_see_also_and_table_of_contents_are_major_headings():
+    chunker = CarModelPDFChunker()
+    font_analysis = {'heading_threshold': 15.0}
+
+    assert chunker.is_major_heading("See also", 20.0, font_analysis)
+    assert chunker.is_major_heading("Table of contents", 20.0, font_analysis)
+
+
+def test_other_skip_keyword_prefixes_are_still_skipped():
+    chunker = CarModelPDFChunker()
+    font_analysis = {'heading_threshold': 15.0}
+
+    # Title case at 20pt would pass as a heading if the skip patterns let these through
+    for text in ("See The List Below", "Seeing Double", "Tables Of Results",
+                 "Pages From History", "Figures And Data"):
+        assert not chunker.is_major_heading(text, 20.0, font_analysis)
+
+
+def test_see_also_ends_extraction_when_dropping_tail_sections(make_pdf):
+    lines = ([("Engines", 20)] + [(line, 10) for line in _body_lines("e", 20)]
+             + [("See also", 20)] + [(line, 10) for line in _body_lines("tail", 20)]
+             + [("References", 20)] + [(line, 10) for line in _body_lines("ref", 20)])
+    chunker = CarModelPDFChunker(drop_tail_sections=True, font_cache_dir=None)
+
+    chunks = chunker.extract_smart_chunks(make_pdf(lines))
+
+    assert [chunk.title for chunk in chunks] == ["Engines"]
+    assert "tail0" not in chunks[0].content
+
+
+def test_corrupt_font_cache_falls_back_to_fresh_analysis(make_pdf, tmp_path):
+    path = make_pdf([("History", 20)] + [(line, 10) for line in _body_lines("h", 20)])
+    cache_dir = str(tmp_path / "cache")
+    chunker = CarModelPDFChunker(font_cache_dir=cache_dir)
+    expected = chunker.extract_smart_chunks(path)
+
+    (cache_file,) = os.listdir(cache_dir)
+    for damage in (b"\x80\x04garbage", b"", b"\x80\x04]\x94."):  # bad bytes, empty, valid non-dict
+        with open(os.path.join(cache_dir, cache_file), "wb") as f:
+            f.write(damage)
+        chunker_mod._font_structure_memo.clear()
+
+        assert chunker.extract_smart_chunks(path) == expected
+
+
+def test_is_major_heading_override_drives_chunking(make_pdf):
+    class MarkerChunker(CarModelPDFChunker):
+        __slots__ = ()
+
+        def is_major_heading(self, text, font_size, font_analysis):
+            return text.startswith("##")
+
+    lines = ([("## Alpha", 10)] + [(line, 10) for line in _body_lines("a", 12)]
+             + [("## Beta", 10)] + [(line, 10) for line in _body_lines("b", 12)])
+    chunker = MarkerChunker(font_cache_dir=None)
+
+    chunks = chunker.extract_smart_chunks(make_pdf(lines))
+
+    assert [chunk.title for chunk in chunks] == ["## Alpha", "## Beta"]
+
+
+def test_chunks_stream_on_font_cache_miss(make_pdf, monkeypatch):
+    lines = []
+    for name in ("History", "Design", "Engines", "Safety", "Reception"):
+        lines += [(name, 20)] + [(line, 10) for line in _body_lines(name.lower(), 60)]
+    path = make_pdf(lines)
+    with chunker_mod.fitz.open(path) as doc:
+        page_count = doc.page_count
+
+    parsed = []
+    page_lines = chunker_mod._page_lines
+    monkeypatch.setattr(chunker_mod, "_page_lines", lambda page, size: parsed.append(1) or page_lines(page, size))
+    chunker = CarModelPDFChunker(font_cache_dir=None)
+
+    chunks = chunker.iter_smart_chunks(path)
+    next(chunks)
+
+    # One sizing pass over every page, then only as far as the first section
+    assert page_count < len(parsed) < 2 * page_count
+    chunks.close()
+
+
+def test_ascii_fast_path_keeps_unicode_whitespace_semantics():
+    # \x1f is ASCII, but only Unicode \s treats it as whitespace
+    assert chunker_mod._heading_test(15.0)("Second\x1fgeneration", 20.0)
+
+
+def test_worker_pool_matches_serial_extraction(make_pdf):
+    lines = []
+    for name in ("History", "Design", "Engines", "Safety", "Reception"):
+        lines += [(name, 20)] + [(line, 10) for line in _body_lines(name.lower(), 250)]
+    path = make_pdf(lines)
+    with fitz.open(path) as doc:
+        assert doc.page_count >= chunker_mod.MIN_PAGES_FOR_WORKERS
+
+    serial = CarModelPDFChunker(font_cache_dir=None).extract_smart_chunks(path)
+    pooled = CarModelPDFChunker(workers=2, font_cache_dir=None).extract_smart_chunks(path)
+
+    assert pooled == serial
+
+
+def test_font_cache_miss_starts_one_worker_pool(make_pdf, monkeypatch):
+    lines = []
+    for name in ("History", "Design", "Engines", "Safety", "Reception"):
+        lines += [(name, 20)] + [(line, 10) for line in _body_lines(name.lower(), 250)]
+    path = make_pdf(lines)
+
+    pools = []
+    executor_cls = chunker_mod.ProcessPoolExecutor
+    monkeypatch.setattr(chunker_mod, "ProcessPoolExecutor",
+                        lambda *args, **kwargs: pools.append(1) or executor_cls(*args, **kwargs))
+    chunker = CarModelPDFChunker(workers=2, font_cache_dir=None)
+
+    assert chunker.extract_smart_chunks(path)
+    assert len(pools) == 1